@@ -1,12 +1,137 @@
-from typing import Dict, List, Set, Optional, Tuple
-import json
+from typing import DefaultDict, Dict, FrozenSet, Iterator, List, Optional, Tuple
+from array import array
+from collections import defaultdict
+from functools import lru_cache, partial
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Без numba используются векторные операции NumPy
+    njit = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # Без orjson используется стандартный модуль json
+    from json import loads as _json_loads
+
+# Пустой результат поиска; как и остальные результаты, только для чтения
+_EMPTY_POSTING = np.empty(0, dtype=np.int32)
+_EMPTY_POSTING.flags.writeable = False
+
+# Списки вхождений считаются плотными, если вместе покрывают не меньше
+# 1/_DENSE_RATIO базы; их объединение строится по битовой карте строк
+_DENSE_RATIO = 4
+
+# Критерий поиска: точное значение атрибута или диапазон (lo, hi)
+# для числовых атрибутов; кортеж другой длины ничего не находит
+Criterion = int | str | Tuple[Optional[int], Optional[int]]
+
+# Количество запоминаемых результатов поиска
+_SEARCH_CACHE_SIZE = 512
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _intersect_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Пересечение двух отсортированных массивов без повторов
+        (слияние двумя указателями).
+        """
+        out = np.empty(min(a.size, b.size), dtype=np.int32)
+        i = j = k = 0
+        while i < a.size and j < b.size:
+            if a[i] < b[j]:
+                i += 1
+            elif a[i] > b[j]:
+                j += 1
+            else:
+                out[k] = a[i]
+                k += 1
+                i += 1
+                j += 1
+        return out[:k]
+
+    @njit(cache=True)
+    def _union_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Объединение двух отсортированных массивов без повторов
+        (слияние двумя указателями).
+        """
+        out = np.empty(a.size + b.size, dtype=np.int32)
+        i = j = k = 0
+        while i < a.size and j < b.size:
+            if a[i] < b[j]:
+                out[k] = a[i]
+                i += 1
+            elif a[i] > b[j]:
+                out[k] = b[j]
+                j += 1
+            else:
+                out[k] = a[i]
+                i += 1
+                j += 1
+            k += 1
+        while i < a.size:
+            out[k] = a[i]
+            i += 1
+            k += 1
+        while j < b.size:
+            out[k] = b[j]
+            j += 1
+            k += 1
+        return out[:k]
+
+    # Компиляция при импорте, чтобы не платить за нее при первом поиске
+    # на изменяемых массивах - такими являются списки вхождений индексов
+    _warmup_posting = np.empty(0, dtype=np.int32)
+    _intersect_sorted(_warmup_posting, _warmup_posting)
+    _union_sorted(_warmup_posting, _warmup_posting)
+    del _warmup_posting
+else:
+    def _intersect_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Пересечение двух отсортированных массивов без повторов"""
+        return np.intersect1d(a, b, assume_unique=True)
+
+    def _union_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Объединение двух отсортированных массивов без повторов"""
+        return np.union1d(a, b)
+
+
+def _read_only(posting: np.ndarray) -> np.ndarray:
+    """
+    Представление массива индексов, доступное только для чтения.
+    Сами списки вхождений индекса остаются изменяемыми, так как
+    передаются в скомпилированные функции слияния.
+    """
+    result = posting.view()
+    result.flags.writeable = False
+    return result
+
+
+def _union_dense(postings: List[np.ndarray], size: int) -> np.ndarray:
+    """
+    Объединение плотных списков вхождений через битовую карту строк.
+    
+    Args:
+        postings (List[np.ndarray]): Отсортированные массивы индексов квартир
+        size (int): Количество квартир в базе данных
+    
+    Returns:
+        np.ndarray: Отсортированный массив индексов без повторов
+    """
+    bitmap = np.zeros(size, dtype=np.bool_)
+    for posting in postings:
+        bitmap[posting] = True
+    return np.flatnonzero(bitmap).astype(np.int32)
+
 
 class Apartment:
     """
     Класс для представления квартиры.
-    Использует tuple для хранения данных для оптимизации памяти.
+    Использует __slots__ для хранения данных для оптимизации памяти.
     """
-    __slots__ = ('_data',)  # Оптимизация использования памяти
+    __slots__ = ('total_area', 'rooms', 'kitchen_area', 'balconies', 'metro')
 
     def __init__(self, total_area: int, rooms: int, kitchen_area: int, 
                  balconies: int, metro: str):
@@ -19,31 +144,12 @@ class Apartment:
             balconies (int): Количество балконов
             metro (str): Ближайшая станция метро
         """
-        # Храним все данные в tuple для экономии памяти
-        self._data: Tuple[int, int, int, int, str] = (
-            total_area, rooms, kitchen_area, balconies, metro
-        )
-    
-    # Свойства для доступа к данным
-    @property
-    def total_area(self) -> int:
-        return self._data[0]
-    
-    @property
-    def rooms(self) -> int:
-        return self._data[1]
-    
-    @property
-    def kitchen_area(self) -> int:
-        return self._data[2]
-    
-    @property
-    def balconies(self) -> int:
-        return self._data[3]
-    
-    @property
-    def metro(self) -> str:
-        return self._data[4]
+        # Атрибуты хранятся прямо в слотах, без обращения через свойства
+        self.total_area: int = total_area
+        self.rooms: int = rooms
+        self.kitchen_area: int = kitchen_area
+        self.balconies: int = balconies
+        self.metro: str = metro
     
     def __str__(self) -> str:
         """Строковое представление квартиры"""
@@ -55,59 +161,133 @@ class Apartment:
 class ApartmentDatabase:
     """
     База данных квартир с инвертированными индексами для быстрого поиска.
-    Использует массивы и хеш-таблицы для эффективного хранения и поиска.
+    Хранит данные по столбцам в массивах NumPy, а индексы - в хеш-таблицах.
     """
     
     def __init__(self):
         """Инициализация пустой базы данных"""
-        # Основной массив для хранения квартир
-        self._apartments: List[Apartment] = []
+        # Данные квартир хранятся по столбцам: отдельный массив на каждый
+        # атрибут, i-й элемент каждого массива относится к i-й квартире
+        self._col_total_area: np.ndarray = np.empty(0, dtype=np.int32)
+        self._col_rooms: np.ndarray = np.empty(0, dtype=np.int16)
+        self._col_kitchen_area: np.ndarray = np.empty(0, dtype=np.int16)
+        self._col_balconies: np.ndarray = np.empty(0, dtype=np.int16)
+        
+        # Станции метро закодированы словарем: в столбце хранится номер
+        # станции, а ее название - в таблице _metro_names
+        self._col_metro: np.ndarray = np.empty(0, dtype=np.int16)
+        self._metro_names: List[str] = []
+        self._metro_to_id: Dict[str, int] = {}
         
         # Инвертированные индексы для быстрого поиска
-        # Каждый индекс отображает значение атрибута на множество индексов квартир
+        # Каждый индекс отображает значение атрибута на отсортированный
+        # массив индексов квартир (np.int32), см. _build_index
         self._indices: Dict[str, Dict] = {
-            'total_area': {},    # int -> Set[int]
-            'rooms': {},         # int -> Set[int]
-            'kitchen_area': {},  # int -> Set[int]
-            'balconies': {},     # int -> Set[int]
-            'metro': {}          # str -> Set[int]
+            'total_area': {},    # int -> np.ndarray[int32]
+            'rooms': {},         # int -> np.ndarray[int32]
+            'kitchen_area': {},  # int -> np.ndarray[int32]
+            'balconies': {},     # int -> np.ndarray[int32]
+            'metro': {}          # номер станции -> np.ndarray[int32]
         }
+        
+        # Индексы для поиска по диапазону значений числовых атрибутов:
+        # индексы квартир, упорядоченные по значению атрибута, и сами
+        # значения в том же порядке
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._sorted_vals: Dict[str, np.ndarray] = {}
+        
+        # Кэш результатов поиска, свой у каждой базы данных.
+        # Сбрасывается при любом изменении данных
+        self._search_impl = lru_cache(maxsize=_SEARCH_CACHE_SIZE)(self._search_impl)
+    
+    def __len__(self) -> int:
+        """Количество квартир в базе данных"""
+        return self._col_total_area.size
     
-    def _clear_indices(self) -> None:
-        """Очистка всех индексов"""
-        for index in self._indices.values():
-            index.clear()
+    @property
+    def total_area_array(self) -> np.ndarray:
+        """Столбец общей площади всех квартир (np.int32, только для чтения)"""
+        return _read_only(self._col_total_area)
     
-    def _add_to_index(self, index_name: str, key: int | str, 
-                      apartment_index: int) -> None:
+    def __getitem__(self, apartment_index: int) -> Apartment:
         """
-        Добавление значения в индекс.
+        Получение квартиры по индексу.
+        Объект Apartment собирается из столбцов при каждом обращении.
         
         Args:
-            index_name (str): Имя индекса ('total_area', 'rooms', etc.)
-            key: Значение атрибута (ключ для индекса)
-            apartment_index (int): Индекс квартиры в основном массиве
+            apartment_index (int): Индекс квартиры в базе данных
+        
+        Returns:
+            Apartment: Квартира с данным индексом
         """
-        if key not in self._indices[index_name]:
-            self._indices[index_name][key] = set()
-        self._indices[index_name][key].add(apartment_index)
+        return Apartment(
+            total_area=int(self._col_total_area[apartment_index]),
+            rooms=int(self._col_rooms[apartment_index]),
+            kitchen_area=int(self._col_kitchen_area[apartment_index]),
+            balconies=int(self._col_balconies[apartment_index]),
+            metro=self._metro_names[self._col_metro[apartment_index]]
+        )
     
-    def _add_apartment(self, apartment: Apartment) -> None:
+    def __iter__(self) -> Iterator[Apartment]:
+        """Перебор всех квартир в порядке их индексов"""
+        return iter(self._gather())
+    
+    def _gather(self, indices: Optional[np.ndarray] = None) -> List[Apartment]:
         """
-        Добавление квартиры в базу данных и обновление всех индексов.
+        Сборка объектов Apartment для набора квартир.
+        Каждый столбец выбирается по индексам и переводится в список
+        целиком, а не поэлементно, как в __getitem__.
         
         Args:
-            apartment (Apartment): Объект квартиры для добавления
+            indices (Optional[np.ndarray]): Индексы квартир (None - все квартиры)
+        
+        Returns:
+            List[Apartment]: Квартиры в порядке переданных индексов
+        """
+        rows = slice(None) if indices is None else indices
+        metro_names = self._metro_names
+        return list(map(
+            Apartment,
+            self._col_total_area[rows].tolist(),
+            self._col_rooms[rows].tolist(),
+            self._col_kitchen_area[rows].tolist(),
+            self._col_balconies[rows].tolist(),
+            [metro_names[m] for m in self._col_metro[rows].tolist()]
+        ))
+    
+    @staticmethod
+    def _build_index(values: List[int]) -> Dict[int, np.ndarray]:
         """
-        apartment_index = len(self._apartments)
-        self._apartments.append(apartment)
+        Построение инвертированного индекса по столбцу значений.
+        
+        Args:
+            values (List[int]): Значения атрибута в порядке индексов квартир
         
-        # Обновление всех индексов
-        self._add_to_index('total_area', apartment.total_area, apartment_index)
-        self._add_to_index('rooms', apartment.rooms, apartment_index)
-        self._add_to_index('kitchen_area', apartment.kitchen_area, apartment_index)
-        self._add_to_index('balconies', apartment.balconies, apartment_index)
-        self._add_to_index('metro', apartment.metro, apartment_index)
+        Returns:
+            Dict[int, np.ndarray]: Отображение значения атрибута на
+            отсортированный массив индексов квартир (np.int32)
+        """
+        # Временные списки хранят индексы в array('i') - по 4 байта на
+        # индекс вместо объекта int, массив NumPy строится без копирования
+        buckets: DefaultDict[int, array] = defaultdict(partial(array, 'i'))
+        for apartment_index, value in enumerate(values):
+            buckets[value].append(apartment_index)
+        # Индексы квартир добавлялись по возрастанию, сортировка не нужна
+        return {key: np.frombuffer(bucket, dtype=np.int32)
+                for key, bucket in buckets.items()}
+    
+    def _build_range_indices(self) -> None:
+        """Построение индексов для поиска по диапазону числовых атрибутов"""
+        numeric_columns = {
+            'total_area': self._col_total_area,
+            'rooms': self._col_rooms,
+            'kitchen_area': self._col_kitchen_area,
+            'balconies': self._col_balconies,
+        }
+        for field, column in numeric_columns.items():
+            order = np.argsort(column, kind='stable').astype(np.int32)
+            self._sorted[field] = order
+            self._sorted_vals[field] = column[order]
     
     def load_from_file(self, filename: str) -> None:
         """
@@ -116,23 +296,49 @@ class ApartmentDatabase:
         Args:
             filename (str): Путь к JSON файлу с данными
         """
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Файл читается в байтах: orjson принимает bytes, json.loads
+        # распознает кодировку UTF-8 самостоятельно
+        with open(filename, 'rb') as f:
+            data = _json_loads(f.read())
         
-        # Очистка существующих данных
-        self._apartments.clear()
-        self._clear_indices()
+        self._metro_names.clear()
+        self._metro_to_id.clear()
+        self._search_impl.cache_clear()
         
-        # Загрузка новых данных
+        # Разбор записей на столбцы за один проход по данным
+        total_areas: List[int] = []
+        rooms: List[int] = []
+        kitchen_areas: List[int] = []
+        balconies: List[int] = []
+        metro_ids: List[int] = []
         for apt_data in data:
-            apartment = Apartment(
-                total_area=int(apt_data['total_area']),
-                rooms=int(apt_data['rooms']),
-                kitchen_area=int(apt_data['kitchen_area']),
-                balconies=int(apt_data['balconies']),
-                metro=apt_data['metro']
-            )
-            self._add_apartment(apartment)
+            total_areas.append(int(apt_data['total_area']))
+            rooms.append(int(apt_data['rooms']))
+            kitchen_areas.append(int(apt_data['kitchen_area']))
+            balconies.append(int(apt_data['balconies']))
+            
+            metro = apt_data['metro']
+            metro_id = self._metro_to_id.get(metro)
+            if metro_id is None:
+                metro_id = len(self._metro_names)
+                self._metro_to_id[metro] = metro_id
+                self._metro_names.append(metro)
+            metro_ids.append(metro_id)
+        
+        self._col_total_area = np.array(total_areas, dtype=np.int32)
+        self._col_rooms = np.array(rooms, dtype=np.int16)
+        self._col_kitchen_area = np.array(kitchen_areas, dtype=np.int16)
+        self._col_balconies = np.array(balconies, dtype=np.int16)
+        self._col_metro = np.array(metro_ids, dtype=np.int16)
+        
+        self._indices = {
+            'total_area': self._build_index(total_areas),
+            'rooms': self._build_index(rooms),
+            'kitchen_area': self._build_index(kitchen_areas),
+            'balconies': self._build_index(balconies),
+            'metro': self._build_index(metro_ids)
+        }
+        self._build_range_indices()
     
     def _get_index_for_field(self, field: str) -> Optional[Dict]:
         """
@@ -146,38 +352,185 @@ class ApartmentDatabase:
         """
         return self._indices.get(field)
     
-    def search(self, criteria: Dict[str, int | str], operator: str = 'AND') -> List[Apartment]:
+    def _range_posting(self, field: str, lo: Optional[int],
+                       hi: Optional[int]) -> Optional[np.ndarray]:
         """
-        Поиск квартир по заданным критериям.
+        Получение индексов квартир со значением атрибута в диапазоне [lo, hi].
         
         Args:
-            criteria (Dict[str, int | str]): Словарь критериев поиска
-            operator (str): Оператор для комбинации критериев ('AND' или 'OR')
+            field (str): Имя числового поля
+            lo (Optional[int]): Нижняя граница (None - без ограничения)
+            hi (Optional[int]): Верхняя граница (None - без ограничения)
         
         Returns:
-            List[Apartment]: Список квартир, удовлетворяющих критериям
+            Optional[np.ndarray]: Отсортированный массив индексов квартир или
+            None, если поле не поддерживает поиск по диапазону
         """
-        if not criteria:
+        order = self._sorted.get(field)
+        if order is None:
+            return None
+        
+        values = self._sorted_vals[field]
+        lo_i = 0 if lo is None else np.searchsorted(values, lo)
+        hi_i = len(values) if hi is None else np.searchsorted(values, hi, side='right')
+        # Индексы упорядочены по значению атрибута, а не по номеру квартиры
+        return np.sort(order[lo_i:hi_i])
+    
+    def search_range(self, field: str, lo: Optional[int] = None,
+                     hi: Optional[int] = None) -> List[Apartment]:
+        """
+        Поиск квартир со значением числового атрибута в диапазоне [lo, hi].
+        В search тот же диапазон задается кортежем (lo, hi) ровно из двух
+        элементов; кортеж другой длины ничего не находит.
+        
+        Args:
+            field (str): Имя числового поля ('total_area', 'rooms', etc.)
+            lo (Optional[int]): Нижняя граница (None - без ограничения)
+            hi (Optional[int]): Верхняя граница (None - без ограничения)
+        
+        Returns:
+            List[Apartment]: Список квартир, удовлетворяющих условию
+        """
+        posting = self._range_posting(field, lo, hi)
+        if posting is None:
             return []
+        return self._gather(posting)
+    
+    def _combine_postings(self, postings: List[np.ndarray],
+                          operator: str) -> np.ndarray:
+        """
+        Комбинация списков вхождений критериев поиска.
+        
+        Args:
+            postings (List[np.ndarray]): Непустой список отсортированных
+                массивов индексов квартир
+            operator (str): Оператор для комбинации ('AND' или 'OR')
+        
+        Returns:
+            np.ndarray: Отсортированный массив индексов квартир
+        """
+        if operator == 'AND':
+            # Начинаем с самых коротких списков, чтобы результат
+            # сокращался как можно быстрее
+            postings.sort(key=len)
+            merge = _intersect_sorted
+        elif (len(postings) > 1
+                and sum(map(len, postings)) * _DENSE_RATIO >= len(self)):
+            # Списки покрывают заметную часть базы: один проход по битовой
+            # карте дешевле, чем цепочка слияний растущего результата
+            return _union_dense(postings, len(self))
+        else:  # OR
+            merge = _union_sorted
+        
+        result_indices = postings[0]
+        for current_indices in postings[1:]:
+            result_indices = merge(result_indices, current_indices)
+        return result_indices
+    
+    def _exact_posting(self, index: Dict, field: str,
+                       value: int | str) -> Optional[np.ndarray]:
+        """
+        Получение списка вхождений для точного значения атрибута.
+        
+        Args:
+            index (Dict): Индекс поля
+            field (str): Имя поля
+            value (int | str): Значение атрибута
+        
+        Returns:
+            Optional[np.ndarray]: Отсортированный массив индексов квартир
+            или None, если значение в индексе отсутствует
+        """
+        if field == 'metro':
+            # Индекс метро построен по номерам станций
+            value = self._metro_to_id.get(value)
+        return index.get(value)
+    
+    def _search_impl(self, frozen_criteria: FrozenSet[Tuple[str, Criterion]],
+                     operator: str) -> np.ndarray:
+        """
+        Вычисление индексов квартир, удовлетворяющих критериям.
+        Результаты запоминаются в кэше (см. __init__), поэтому возвращаемый
+        массив доступен только для чтения.
+        
+        Args:
+            frozen_criteria (FrozenSet[Tuple[str, Criterion]]): Пары
+                (поле, значение) критериев поиска
+            operator (str): Оператор для комбинации критериев ('AND' или 'OR')
         
-        result_indices: Optional[Set[int]] = None
+        Returns:
+            np.ndarray: Отсортированный массив индексов квартир
+        """
+        postings: List[np.ndarray] = []
         
-        for field, value in criteria.items():
+        for field, value in frozen_criteria:
             index = self._get_index_for_field(field)
             if index is None:
                 continue
-                
-            current_indices = index.get(value, set())
-            
-            if result_indices is None:
-                result_indices = current_indices.copy()
+            if isinstance(value, tuple):
+                # Кортеж другой длины не является диапазоном и ничего не находит
+                posting = self._range_posting(field, *value) if len(value) == 2 else None
             else:
+                posting = self._exact_posting(index, field, value)
+            
+            if posting is None or posting.size == 0:
+                # Для AND пустой критерий делает пустым весь результат,
+                # остальные индексы можно не просматривать
                 if operator == 'AND':
-                    result_indices &= current_indices
-                else:  # OR
-                    result_indices |= current_indices
+                    return _EMPTY_POSTING
+                continue
+            postings.append(posting)
         
-        if not result_indices:
-            return []
-            
-        return [self._apartments[i] for i in sorted(result_indices)] 
\ No newline at end of file
+        if not postings:
+            return _EMPTY_POSTING
+        
+        return _read_only(self._combine_postings(postings, operator))
+    
+    def search_indices(self, criteria: Dict[str, Criterion],
+                       operator: str = 'AND') -> np.ndarray:
+        """
+        Поиск индексов квартир по заданным критериям без создания
+        объектов Apartment. Критерии задаются так же, как в search.
+        
+        Args:
+            criteria (Dict[str, Criterion]): Словарь критериев поиска
+            operator (str): Оператор для комбинации критериев ('AND' или 'OR')
+        
+        Returns:
+            np.ndarray: Отсортированный массив индексов квартир (только для чтения)
+        """
+        if not criteria:
+            return _EMPTY_POSTING
+        
+        if len(criteria) == 1:
+            # Один точный критерий: список вхождений берется прямо из
+            # индекса, без кэша и слияний
+            (field, value), = criteria.items()
+            if not isinstance(value, tuple):
+                index = self._get_index_for_field(field)
+                if index is None:
+                    return _EMPTY_POSTING
+                posting = self._exact_posting(index, field, value)
+                return _EMPTY_POSTING if posting is None else _read_only(posting)
+        
+        return self._search_impl(frozenset(criteria.items()), operator)
+    
+    def search(self, criteria: Dict[str, Criterion], operator: str = 'AND') -> List[Apartment]:
+        """
+        Поиск квартир по заданным критериям.
+        Для числовых полей вместо значения можно передать диапазон
+        (lo, hi), границы включаются, None означает отсутствие границы.
+        Кортеж из другого числа элементов считается критерием, которому
+        не соответствует ни одна квартира.
+        
+        Args:
+            criteria (Dict[str, Criterion]): Словарь критериев поиска
+            operator (str): Оператор для комбинации критериев ('AND' или 'OR')
+        
+        Returns:
+            List[Apartment]: Список квартир, удовлетворяющих критериям
+        """
+        result_indices = self.search_indices(criteria, operator)
+        
+        # Массив уже отсортирован по возрастанию индексов квартир
+        return self._gather(result_indices)
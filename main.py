@@ -106,6 +106,13 @@ def test_apartment_database() -> None:
         },
         'OR'
     )
+    
+    # Тест 5: Поиск по диапазону значений
+    run_search_test(
+        db,
+        "Тест 5: Поиск квартир площадью от 60 до 80м²",
+        {'total_area': (60, 80)}
+    )
 
 if __name__ == "__main__":
     test_apartment_database()
@@ -4,21 +4,25 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from apartment import ApartmentDatabase
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 import os
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+import numpy as np
+
+# Количество строк таблицы квартир, форматируемых за один раз
+ROW_CHUNK_SIZE = 4096
+
+# Регистрация шрифта выполняется один раз при импорте модуля
+if 'Roboto' not in pdfmetrics.getRegisteredFontNames():
+    font_path = os.path.join(os.path.dirname(__file__), 'fonts', 'RobotoMono[wght].ttf')
+    pdfmetrics.registerFont(TTFont('Roboto', font_path))
 
 class ApartmentReportGenerator:
     """Генератор PDF-отчетов для базы данных квартир"""
     
     def __init__(self):
         """Инициализация генератора отчетов"""
-        
-        # Регистрация шрифта
-        font_path = os.path.join(os.path.dirname(__file__), 'fonts', 'RobotoMono[wght].ttf')
-        pdfmetrics.registerFont(TTFont('Roboto', font_path))
-        
         # Создание стилей
         self.styles = getSampleStyleSheet()
         self._create_custom_styles()
@@ -59,9 +63,10 @@ class ApartmentReportGenerator:
         ))
         
         # Статистика
-        total_apartments = len(db._apartments)
+        areas = db.total_area_array
+        total_apartments = int(areas.size)
         unique_metros = len(db._indices['metro'])
-        avg_area = sum(apt.total_area for apt in db._apartments) / total_apartments if total_apartments > 0 else 0
+        avg_area = float(areas.mean()) if total_apartments > 0 else 0.0
         
         summary_data = [
             ['Всего квартир:', str(total_apartments)],
@@ -84,21 +89,41 @@ class ApartmentReportGenerator:
         
         return elements
     
-    def _create_apartment_table(self, apartments: List) -> Table:
+    def _format_apartment_rows(self, db: ApartmentDatabase,
+                               indices: Optional[np.ndarray] = None) -> Iterator[Tuple[str, ...]]:
+        """
+        Построчное формирование ячеек таблицы квартир из столбцов базы данных.
+        Столбцы форматируются порциями по ROW_CHUNK_SIZE строк, поэтому
+        промежуточные строковые массивы не превышают размера одной порции.
+        
+        Args:
+            db (ApartmentDatabase): База данных квартир
+            indices (Optional[np.ndarray]): Индексы выводимых квартир
+                (None - все квартиры)
+        
+        Returns:
+            Iterator[Tuple[str, ...]]: Ячейки строк таблицы: комнаты, площадь,
+            кухня, балконы и метро
+        """
+        count = len(db) if indices is None else indices.size
+        for start in range(0, count, ROW_CHUNK_SIZE):
+            stop = start + ROW_CHUNK_SIZE
+            rows = slice(start, stop) if indices is None else indices[start:stop]
+            rooms = db._col_rooms[rows].astype(str).tolist()
+            areas = np.char.add(db._col_total_area[rows].astype(str), ' м²').tolist()
+            kitchens = np.char.add(db._col_kitchen_area[rows].astype(str), ' м²').tolist()
+            balconies = db._col_balconies[rows].astype(str).tolist()
+            metros = [db._metro_names[m] for m in db._col_metro[rows].tolist()]
+            yield from zip(rooms, areas, kitchens, balconies, metros)
+    
+    def _create_apartment_table(self, db: ApartmentDatabase) -> Table:
         """Создание таблицы с информацией о квартирах"""
         # Заголовки таблицы
         headers = ['Комнат', 'Площадь', 'Кухня', 'Балконы', 'Метро']
         
         # Данные для таблицы
         data = [headers]
-        for apt in apartments:
-            data.append([
-                str(apt.rooms),
-                f"{apt.total_area} м²",
-                f"{apt.kitchen_area} м²",
-                str(apt.balconies),
-                apt.metro
-            ])
+        data.extend(self._format_apartment_rows(db))
         
         # Создание таблицы
         table = Table(data, colWidths=[60, 80, 80, 60, 150])
@@ -132,8 +157,12 @@ class ApartmentReportGenerator:
             
             # Создаем таблицу для каждого индекса
             index_rows = []
-            for key, value_set in index_data.items():
-                index_rows.append([str(key), f"Записи: {sorted(value_set)}"])
+            for key, posting in index_data.items():
+                # Индекс метро хранит номера станций вместо названий
+                label = db._metro_names[key] if index_name == 'metro' else str(key)
+                # Списки вхождений уже отсортированы, достаточно их вывести
+                records = ', '.join(map(str, posting.tolist()))
+                index_rows.append([label, f"Записи: [{records}]"])
             
             if index_rows:
                 index_table = Table(index_rows, colWidths=[100, 300])
@@ -189,19 +218,14 @@ class ApartmentReportGenerator:
                 self.styles['CustomBody']
             ))
             
-            results = db.search(test['criteria'], test['operator'])
+            # Строки таблицы формируются прямо из столбцов базы данных
+            # по найденным индексам, без промежуточных объектов Apartment
+            result_indices = db.search_indices(test['criteria'], test['operator'])
             
-            if results:
+            if result_indices.size:
                 # Создаем таблицу с результатами
                 data = [['Комнат', 'Площадь', 'Кухня', 'Балконы', 'Метро']]
-                for apt in results:
-                    data.append([
-                        str(apt.rooms),
-                        f"{apt.total_area} м²",
-                        f"{apt.kitchen_area} м²",
-                        str(apt.balconies),
-                        apt.metro
-                    ])
+                data.extend(self._format_apartment_rows(db, result_indices))
                 
                 results_table = Table(data, colWidths=[60, 80, 80, 60, 150])
                 results_table.setStyle(TableStyle([
@@ -238,10 +262,10 @@ class ApartmentReportGenerator:
             Основные компоненты системы:""",
             
             """1. Структура данных:
-            - Основной список квартир хранится в памяти
+            - Данные квартир хранятся в памяти по столбцам: отдельный массив на каждый атрибут
             - Для каждого атрибута (площадь, комнаты, метро и т.д.) создается отдельный индекс
             - Каждый индекс представляет собой хеш-таблицу, где ключ - это значение атрибута, 
-              а значение - множество индексов квартир с таким значением атрибута""",
+              а значение - отсортированный массив индексов квартир с таким значением атрибута""",
             
             """2. Процесс индексации:
             - При добавлении новой квартиры она получает уникальный индекс
@@ -250,14 +274,17 @@ class ApartmentReportGenerator:
             
             """3. Процесс поиска:
             - Для каждого критерия поиска система обращается к соответствующему индексу
-            - Получает множество индексов квартир, удовлетворяющих критерию
-            - При использовании оператора AND выполняется пересечение множеств
-            - При использовании оператора OR выполняется объединение множеств
+            - Получает отсортированный массив индексов квартир, удовлетворяющих критерию
+            - Для числовых атрибутов возможен поиск по диапазону значений: бинарный поиск
+              по отсортированному столбцу
+            - При использовании оператора AND выполняется пересечение массивов, начиная с самых
+              коротких; если по одному из критериев ничего не найдено, поиск сразу завершается
+            - При использовании оператора OR выполняется объединение массивов
             - На основе полученных индексов формируется итоговый список квартир""",
             
             """4. Преимущества подхода:
             - Быстрый поиск по любой комбинации критериев
-            - Эффективное использование памяти благодаря множествам
+            - Эффективное использование памяти благодаря компактным массивам np.int32
             - Возможность комбинировать условия через операторы AND и OR
             - Легкое добавление новых критериев поиска"""
         ]
@@ -271,6 +298,33 @@ class ApartmentReportGenerator:
         
         return elements
     
+    def _create_apartment_list_section(self, db: ApartmentDatabase) -> List:
+        """Создание секции со списком всех квартир"""
+        return [
+            Paragraph('Полный список квартир', self.styles['CustomHeader']),
+            self._create_apartment_table(db)
+        ]
+    
+    def _build_sections(self, db: ApartmentDatabase) -> List[List]:
+        """
+        Построение секций отчета.
+        Секции строятся последовательно: элементы ReportLab дороже передавать
+        между процессами через pickle, чем строить заново.
+        
+        Args:
+            db (ApartmentDatabase): База данных квартир
+        
+        Returns:
+            List[List]: Элементы каждой секции в порядке их следования в отчете
+        """
+        return [
+            self._create_logic_description(),
+            self._create_database_summary(db),
+            self._create_index_section(db),
+            self._create_search_results_section(db),
+            self._create_apartment_list_section(db),
+        ]
+    
     def generate_report(self, db: ApartmentDatabase, filename: str) -> None:
         """
         Генерация PDF-отчета по базе данных квартир.
@@ -297,24 +351,10 @@ class ApartmentReportGenerator:
             self.styles['CustomTitle']
         ))
         
-        # Добавление описания логики работы
-        elements.extend(self._create_logic_description())
-        
-        # Добавление общей информации
-        elements.extend(self._create_database_summary(db))
-        
-        # Добавление информации об индексах
-        elements.extend(self._create_index_section(db))
-        
-        # Добавление результатов поиска
-        elements.extend(self._create_search_results_section(db))
-        
-        # Секция со списком всех квартир
-        elements.append(Paragraph(
-            'Полный список квартир',
-            self.styles['CustomHeader']
-        ))
-        elements.append(self._create_apartment_table(db._apartments))
+        # Описание логики работы, общая информация, индексы, результаты
+        # поиска и полный список квартир
+        for section in self._build_sections(db):
+            elements.extend(section)
         
         # Генерация отчета
         doc.build(elements)